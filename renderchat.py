@@ -6,23 +6,208 @@ Render ChatGPT, Claude, or Grok conversations into a single static HTML page wit
 from __future__ import annotations
 
 import argparse
+import asyncio
+import hashlib
 import html
+import http.client
 import json
+import os
 import pathlib
 import re
+import secrets
 import subprocess
 import sys
+import tempfile
+import threading
 import time
+import urllib.request
 import webbrowser
+from collections import Counter
 from dataclasses import dataclass
-from typing import List
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 import markdown
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Comment
 from markdownify import markdownify as md
+from playwright.sync_api import Browser, Page, Playwright
 from playwright.sync_api import TimeoutError as PlaywrightTimeout
 from playwright.sync_api import sync_playwright
 
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "fast" extra
+    orjson = None
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext as AsyncBrowserContext
+    from playwright.async_api import Page as AsyncPage
+    from pygments.lexer import Lexer
+
+# Matches UI widgets such as "Copy code" buttons by any class containing "copy" (case-insensitive)
+_COPY_UI_SELECTOR = '[class*="copy" i]'
+# Marker text Claude shows in place of attachments in shared conversations
+_FILES_HIDDEN_RE = re.compile(r"files hidden", re.IGNORECASE)
+# Attachment markers in extracted messages (our own note, or Claude's marker text)
+_ATTACHMENT_HIDDEN_RE = re.compile(r"attachment hidden|files hidden", re.IGNORECASE)
+# Conversation ID in share URLs
+_SHARE_ID_RE = re.compile(r"/share/([a-f0-9-]+)")
+# <script type="application/json"> blocks, where ChatGPT share pages embed the conversation data
+_JSON_SCRIPT_RE = re.compile(r'<script\b[^>]*\btype="application/json"[^>]*>(.*?)</script>', re.DOTALL)
+# Common language identifiers that markdownify emits on the line after an opening fence
+_CODE_LANGS = frozenset(
+    {
+        "python",
+        "javascript",
+        "typescript",
+        "bash",
+        "sh",
+        "json",
+        "yaml",
+        "yml",
+        "html",
+        "css",
+        "jsx",
+        "tsx",
+        "java",
+        "cpp",
+        "c",
+        "go",
+        "rust",
+        "ruby",
+        "php",
+    }
+)
+# A fence line (``` plus at most 17 more characters), optionally followed by a line holding
+# only a language identifier that belongs on the fence itself
+_FENCE_RE = re.compile(
+    r"^[^\S\n]*```(?:[^\n]{0,16}\S)?[^\S\n]*$"
+    r"(?:\n[^\S\n]*(" + "|".join(sorted(_CODE_LANGS, key=len, reverse=True)) + r")[^\S\n]*$)?",
+    re.MULTILINE | re.IGNORECASE,
+)
+# Placeholder comments that stand in for highlighted code blocks while the markdown HTML is serialized
+_CODE_PLACEHOLDER_PREFIX = "renderchat-code-"
+
+# Python-Markdown extensions used to render message content
+_MARKDOWN_EXTENSIONS = ["fenced_code", "tables", "nl2br", "sane_lists"]
+# Per-thread Markdown converters (see _markdown_converter)
+_MARKDOWN_THREAD_STATE = threading.local()
+
+# Code blocks longer than this are not syntax highlighted (Pygments lexers are slow on huge inputs)
+_HIGHLIGHT_MAX_CHARS = 20_000
+
+
+# Page loads wait for "domcontentloaded" and then for a selector that marks the conversation as
+# rendered; timeouts are in milliseconds
+_PAGE_LOAD_TIMEOUT = 60000
+_PLATFORM_CONTENT_WAITS = {
+    "chatgpt": ('[data-testid*="conversation"]', 10000),
+    "claude": (r"div.standard-markdown, div.\!font-user-message", 15000),
+    "grok": ('div[class*="message-bubble"]', 15000),
+}
+# The interstitial Cloudflare shows while it checks the browser, and how long to let it finish
+_CLOUDFLARE_CHALLENGE_SELECTOR = 'text="Just a moment"'
+_CLOUDFLARE_CHALLENGE_TIMEOUT = 30000
+_CLOUDFLARE_DETECTED_MESSAGE = "⚠️  Cloudflare challenge detected, waiting up to 30s for it to complete..."
+_CLOUDFLARE_BLOCKED_MESSAGE = (
+    "Cloudflare challenge did not complete. "
+    "The site is blocking automated access. "
+    "Try accessing the URL in a regular browser first."
+)
+
+# Rendered pages are cached here so repeat runs on the same URL skip the browser. The directory is
+# per-user (and created private) so other local users can neither read nor plant cached pages.
+_CACHE_DIR = pathlib.Path(os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache") / "renderchat"
+DEFAULT_CACHE_TTL = 24 * 60 * 60  # seconds
+
+# Playwright browser used per platform: Chromium launches and drives pages faster,
+# but Firefox gets through Claude's Cloudflare bot check more reliably
+_PLATFORM_BROWSERS = {"chatgpt": "chromium", "claude": "firefox", "grok": "chromium"}
+_BROWSER_USER_AGENTS = {
+    "chromium": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+    ),
+    "firefox": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:133.0) Gecko/20100101 Firefox/133.0",
+}
+# Stealth launch and context options shared by the sync and async fetchers
+_BROWSER_LAUNCH_OPTIONS = {
+    "chromium": {
+        "headless": True,
+        "args": ["--disable-blink-features=AutomationControlled"],
+    },
+    "firefox": {
+        "headless": True,
+        "firefox_user_prefs": {
+            "dom.webdriver.enabled": False,
+            "useAutomationExtension": False,
+        },
+    },
+}
+_BROWSER_CONTEXT_OPTIONS = {
+    "viewport": {"width": 1920, "height": 1080},
+    "locale": "en-US",
+    "timezone_id": "America/New_York",
+    "extra_http_headers": {
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.5",
+        "Accept-Encoding": "gzip, deflate, br",
+        "DNT": "1",
+        "Connection": "keep-alive",
+        "Upgrade-Insecure-Requests": "1",
+        "Sec-Fetch-Dest": "document",
+        "Sec-Fetch-Mode": "navigate",
+        "Sec-Fetch-Site": "none",
+        "Sec-Fetch-User": "?1",
+    },
+}
+# Init script that hides navigator.webdriver from the page
+_STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+"""
+
+
+def json_loads(text: str) -> Any:
+    """
+    Parse JSON text, using orjson when it is installed.
+
+    Args:
+        text: JSON document
+
+    Returns:
+        Parsed Python object
+
+    Raises:
+        json.JSONDecodeError: If the text is not valid JSON
+    """
+    if orjson is not None:
+        try:
+            # orjson rejects str subclasses such as BeautifulSoup's NavigableString
+            return orjson.loads(str(text))
+        except orjson.JSONDecodeError:
+            pass  # orjson is stricter than json (e.g. about out-of-range numbers), so let json decide
+    return json.loads(text)
+
+
+def json_dumps(obj: Any) -> str:
+    """
+    Serialize an object to compact UTF-8 JSON text, using orjson when it is installed.
+
+    The json fallback matches orjson's output format: no whitespace between items and
+    non-ASCII characters written as-is rather than escaped.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        JSON text
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
 
 @dataclass
 class Message:
@@ -38,19 +223,41 @@ class Message:
     content: str
 
 
-def ensure_firefox_installed() -> None:
+def browser_executable_path(browser_name: str, playwright: Optional[Playwright] = None) -> Optional[str]:
+    """
+    Look up where Playwright expects a browser's executable.
+
+    Args:
+        browser_name: Playwright browser to look up ('chromium' or 'firefox')
+        playwright: Running Playwright instance to use, or None to start a temporary one
+
+    Returns:
+        Path of the browser executable, or None if unknown
+    """
+    if playwright is not None:
+        return getattr(getattr(playwright, browser_name), "executable_path", None)
+    with sync_playwright() as p:
+        return getattr(getattr(p, browser_name), "executable_path", None)
+
+
+def ensure_browser_installed(browser_name: str, playwright: Optional[Playwright] = None) -> None:
     """
-    Ensure Playwright's Firefox browser is installed.
+    Ensure a Playwright browser is installed.
     Auto-installs if not present.
 
+    Args:
+        browser_name: Playwright browser to check ('chromium' or 'firefox')
+        playwright: Running Playwright instance to check with (the sync API cannot be nested)
+
     Raises:
         RuntimeError: If installation fails
     """
-    # Check if Firefox is already installed by verifying the executable exists
+    display_name = browser_name.capitalize()
+
+    # Check if the browser is already installed by verifying the executable exists
     executable_path = None
     try:
-        with sync_playwright() as p:
-            executable_path = getattr(p.firefox, "executable_path", None)
+        executable_path = browser_executable_path(browser_name, playwright)
     except Exception:
         # If Playwright driver isn't ready yet, we'll attempt installation below
         executable_path = None
@@ -58,21 +265,20 @@ def ensure_firefox_installed() -> None:
     if executable_path and pathlib.Path(executable_path).exists():
         return
 
-    print("📦 Installing Playwright Firefox browser (first time only)...", file=sys.stderr)
+    print(f"📦 Installing Playwright {display_name} browser (first time only)...", file=sys.stderr)
     try:
         subprocess.run(
-            [sys.executable, "-m", "playwright", "install", "firefox"],
+            [sys.executable, "-m", "playwright", "install", browser_name],
             capture_output=True,
             text=True,
             check=True,
         )
         # Verify installation by re-checking the executable existence
-        with sync_playwright() as p:
-            installed_path = getattr(p.firefox, "executable_path", None)
-        assert installed_path and pathlib.Path(installed_path).exists(), "Firefox executable missing after install"
-        print("✓ Firefox installed successfully", file=sys.stderr)
+        installed_path = browser_executable_path(browser_name, playwright)
+        assert installed_path and pathlib.Path(installed_path).exists(), f"{display_name} missing after install"
+        print(f"✓ {display_name} installed successfully", file=sys.stderr)
     except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"Failed to install Firefox: {e.stderr}") from e
+        raise RuntimeError(f"Failed to install {display_name}: {e.stderr}") from e
 
 
 def extract_claude_conversation(html_content: str) -> List[Message]:
@@ -88,7 +294,7 @@ def extract_claude_conversation(html_content: str) -> List[Message]:
     Raises:
         ValueError: If conversation data cannot be extracted
     """
-    soup = BeautifulSoup(html_content, "html.parser")
+    soup = BeautifulSoup(html_content, "lxml")
     messages = []
 
     # Find all message containers
@@ -97,37 +303,27 @@ def extract_claude_conversation(html_content: str) -> List[Message]:
     # (avoid parent divs which only have it in CSS selectors like [&_.standard-markdown_...])
 
     # First, check for file/attachment indicators
-    file_indicators = soup.find_all(string=lambda t: t and "files hidden" in t.lower() if t else False)
-    has_hidden_files = len(file_indicators) > 0
-
-    # Combine and sort by document order
-    all_content_divs = []
-    for div in soup.find_all("div"):
-        classes = div.get("class", [])
-        if "!font-user-message" in classes:
-            all_content_divs.append((div, "user"))
-        # Check if 'standard-markdown' is an exact class, not just in a selector
-        # Parent divs have font-claude-response, children have standard-markdown as literal class
-        elif "standard-markdown" in classes and "font-claude-response" not in classes:
-            all_content_divs.append((div, "assistant"))
+    has_hidden_files = soup.find(string=_FILES_HIDDEN_RE) is not None
+
+    # Select both kinds of message containers in a single pass, in document order
+    # Parent divs have font-claude-response, children have standard-markdown as literal class
+    all_content_divs = soup.select(r"div.\!font-user-message, div.standard-markdown:not(.font-claude-response)")
 
     # If files are hidden, add a note to the first user message
     added_file_note = False
 
-    for div, role in all_content_divs:
+    for div in all_content_divs:
+        role = "user" if "!font-user-message" in div.get("class", []) else "assistant"
 
-        # Extract HTML content and convert to markdown
-        content_copy = BeautifulSoup(str(div), "html.parser")
-
-        # Remove buttons and UI elements
-        for button in content_copy.find_all("button"):
+        # Remove buttons and UI elements in place (the soup is discarded after extraction)
+        for button in div.find_all("button"):
             button.decompose()
-        for elem in content_copy.find_all(class_=lambda x: x and "copy" in str(x).lower() if x else False):
+        for elem in div.select(_COPY_UI_SELECTOR):
             elem.decompose()
 
         # Convert to markdown
         markdown_text = md(
-            str(content_copy),
+            str(div),
             heading_style="ATX",
             code_language="",
             escape_asterisks=False,
@@ -141,8 +337,8 @@ def extract_claude_conversation(html_content: str) -> List[Message]:
         # Add attachment note to first user message if files are hidden
         if has_hidden_files and role == "user" and not added_file_note:
             markdown_text = (
-                "📎 **[Attachment Hidden]** *(Files/images are not included in shared conversations)*\n\n"
-                + markdown_text
+                "📎 **[Attachment Hidden]** *(Files/images are not included in shared conversations)*"
+                f"\n\n{markdown_text}"
             )
             added_file_note = True
 
@@ -168,19 +364,19 @@ def extract_grok_conversation(html_content: str) -> List[Message]:
     Raises:
         ValueError: If conversation data cannot be extracted
     """
-    soup = BeautifulSoup(html_content, "html.parser")
+    soup = BeautifulSoup(html_content, "lxml")
     messages = []
 
     # Check for attachments/images in the conversation
     # Grok uses 'inline-media-container' sections for images/attachments
     # These are empty in shared conversations when media was present
-    media_containers = soup.find_all("section", class_=lambda x: x and "inline-media-container" in x if x else False)
+    media_containers = soup.select('section[class*="inline-media-container"]')
     has_hidden_attachments = any(not container.get_text().strip() for container in media_containers)
 
     # Grok uses 'message-bubble' class for messages
     # User messages have parent with 'items-end' (right-aligned)
     # Assistant messages have parent with 'items-start' (left-aligned)
-    message_bubbles = soup.find_all("div", class_=lambda x: x and "message-bubble" in x if x else False)
+    message_bubbles = soup.select('div[class*="message-bubble"]')
 
     added_attachment_note = False
 
@@ -198,18 +394,15 @@ def extract_grok_conversation(html_content: str) -> List[Message]:
         if not role:
             continue
 
-        # Extract content
-        content_copy = BeautifulSoup(str(bubble), "html.parser")
-
-        # Remove UI elements
-        for button in content_copy.find_all("button"):
+        # Remove UI elements in place (the soup is discarded after extraction)
+        for button in bubble.find_all("button"):
             button.decompose()
-        for elem in content_copy.find_all(class_=lambda x: x and "copy" in str(x).lower() if x else False):
+        for elem in bubble.select(_COPY_UI_SELECTOR):
             elem.decompose()
 
         # Convert to markdown
         markdown_text = md(
-            str(content_copy),
+            str(bubble),
             heading_style="ATX",
             code_language="",
             escape_asterisks=False,
@@ -222,8 +415,8 @@ def extract_grok_conversation(html_content: str) -> List[Message]:
         # Add attachment note to first user message if attachments are hidden
         if has_hidden_attachments and role == "user" and not added_attachment_note:
             markdown_text = (
-                "📎 **[Attachment Hidden]** *(Files/images are not included in shared conversations)*\n\n"
-                + markdown_text
+                "📎 **[Attachment Hidden]** *(Files/images are not included in shared conversations)*"
+                f"\n\n{markdown_text}"
             )
             added_attachment_note = True
 
@@ -236,6 +429,20 @@ def extract_grok_conversation(html_content: str) -> List[Message]:
     return messages
 
 
+def _merge_fence_language(match: re.Match) -> str:
+    """
+    Replacement callback for _FENCE_RE that keeps the language (if any) on the fence line.
+
+    Args:
+        match: Match of a fence line and its optional language line
+
+    Returns:
+        The normalized fence line
+    """
+    language = match.group(1)
+    return f"```{language}" if language else "```"
+
+
 def clean_markdown_code_blocks(markdown_text: str) -> str:
     """
     Clean up markdown code blocks to ensure proper formatting.
@@ -246,48 +453,8 @@ def clean_markdown_code_blocks(markdown_text: str) -> str:
     Returns:
         Cleaned markdown with properly formatted code blocks
     """
-    lines = markdown_text.split("\n")
-    cleaned_lines = []
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        # If we find a ``` line
-        if line.strip() == "```" or (line.strip().startswith("```") and len(line.strip()) <= 20):
-            # Check if the next line is a language identifier
-            if i + 1 < len(lines):
-                next_line = lines[i + 1].strip()
-                # Common language identifiers
-                languages = {
-                    "python",
-                    "javascript",
-                    "typescript",
-                    "bash",
-                    "sh",
-                    "json",
-                    "yaml",
-                    "yml",
-                    "html",
-                    "css",
-                    "jsx",
-                    "tsx",
-                    "java",
-                    "cpp",
-                    "c",
-                    "go",
-                    "rust",
-                    "ruby",
-                    "php",
-                }
-                if next_line.lower() in languages:
-                    # Merge the language onto the ``` line
-                    cleaned_lines.append(f"```{next_line}")
-                    i += 2  # Skip both lines
-                    continue
-            cleaned_lines.append("```")
-        else:
-            cleaned_lines.append(line)
-        i += 1
-    return "\n".join(cleaned_lines).strip()
+    # Normalize every fence line to a bare ``` and merge a following language line onto it
+    return _FENCE_RE.sub(_merge_fence_language, markdown_text).strip()
 
 
 def extract_conversation_from_html(html_content: str) -> List[Message]:
@@ -303,8 +470,12 @@ def extract_conversation_from_html(html_content: str) -> List[Message]:
     Raises:
         ValueError: If conversation data cannot be extracted
     """
-    soup = BeautifulSoup(html_content, "html.parser")
-    messages = []
+    # Prefer the embedded JSON, so static, rendered, and cached copies of a page give the same conversation
+    messages = extract_messages_from_share_page(html_content)
+    if messages:
+        return messages
+
+    soup = BeautifulSoup(html_content, "lxml")
 
     # Look for conversation turn elements
     # ChatGPT uses data-message-author-role attribute
@@ -319,23 +490,22 @@ def extract_conversation_from_html(html_content: str) -> List[Message]:
 
             # Extract text content from the message
             # Look for the prose content div
-            content_div = div.find("div", class_=lambda x: x and "prose" in x if x else False)
+            content_div = div.select_one('div[class*="prose"]')
 
             if not content_div:
                 # Fallback: get all text from the div
                 content_div = div
 
             # Clean up HTML before conversion
-            # Remove "Copy code" buttons and other UI elements
-            content_copy = BeautifulSoup(str(content_div), "html.parser")
-            for button in content_copy.find_all("button"):
+            # Remove "Copy code" buttons and other UI elements in place (the soup is discarded after extraction)
+            for button in content_div.find_all("button"):
                 button.decompose()
-            for elem in content_copy.find_all(class_=lambda x: x and "copy" in str(x).lower() if x else False):
+            for elem in content_div.select(_COPY_UI_SELECTOR):
                 elem.decompose()
 
             # Convert HTML to markdown to preserve formatting
             markdown_text = md(
-                str(content_copy),
+                str(content_div),
                 heading_style="ATX",
                 code_language="",
                 escape_asterisks=False,
@@ -349,65 +519,133 @@ def extract_conversation_from_html(html_content: str) -> List[Message]:
             if markdown_text:
                 messages.append(Message(role=role, content=markdown_text))
 
-    # Fallback: Try to extract from script tags with JSON data
     if not messages:
-        script_tags = soup.find_all("script", {"type": "application/json"})
-
-        for script in script_tags:
-            if not script.string:
-                continue
+        raise ValueError("Could not extract conversation data from the page")
 
-            try:
-                data = json.loads(script.string)
+    return messages
 
-                # Navigate the data structure to find conversation
-                if "props" in data and "pageProps" in data["props"]:
-                    server_response = data["props"]["pageProps"].get("serverResponse", {})
-                    data_obj = server_response.get("data", {})
 
-                    if not data_obj:
-                        continue
+def extract_messages_from_share_data(data: dict) -> List[Message]:
+    """
+    Extract conversation messages from the JSON data embedded in a ChatGPT share page.
 
-                    # Extract messages from mapping
-                    mapping = data_obj.get("mapping", {})
-                    if not mapping:
-                        continue
+    Args:
+        data: Parsed contents of a <script type="application/json"> tag
 
-                    for node_data in mapping.values():
-                        message_data = node_data.get("message")
-                        if not message_data:
-                            continue
+    Returns:
+        List of Message objects (empty if the data holds no conversation)
 
-                        author = message_data.get("author", {})
-                        role = author.get("role", "")
+    Raises:
+        KeyError, TypeError, AttributeError: If the data does not have the expected shape
+    """
+    messages = []
 
-                        if role not in ["user", "assistant"]:
-                            continue
+    # Navigate the data structure to find conversation
+    if "props" not in data or "pageProps" not in data["props"]:
+        return messages
+
+    server_response = data["props"]["pageProps"].get("serverResponse", {})
+    data_obj = server_response.get("data", {})
+    if not data_obj:
+        return messages
+
+    # Walk from the node the conversation ended on back to the root through parent links; the
+    # mapping also holds abandoned branches (e.g. answers that were regenerated), which are skipped
+    mapping = data_obj.get("mapping", {})
+    node_id = data_obj.get("current_node")
+    if node_id in mapping:
+        branch = []
+        while node_id in mapping and len(branch) <= len(mapping):
+            node_data = mapping[node_id]
+            branch.append(node_data)
+            node_id = node_data.get("parent")
+        branch.reverse()
+    else:
+        # No usable current node: fall back to the mapping's own order
+        branch = list(mapping.values())
 
-                        content = message_data.get("content", {})
-                        parts = content.get("parts", [])
+    for node_data in branch:
+        message_data = node_data.get("message")
+        if not message_data:
+            continue
 
-                        if not parts:
-                            continue
+        author = message_data.get("author", {})
+        role = author.get("role", "")
 
-                        # Join all parts into a single message
-                        text = "\n".join(str(part) for part in parts if part)
+        if role not in ["user", "assistant"]:
+            continue
 
-                        if text.strip():
-                            messages.append(Message(role=role, content=text.strip()))
+        content = message_data.get("content", {})
+        parts = content.get("parts", [])
 
-                    if messages:
-                        return messages
+        if not parts:
+            continue
 
-            except (json.JSONDecodeError, KeyError, TypeError):
-                continue
+        # Join the text parts into a single message (images and other attachments are dicts)
+        text = "\n".join(part for part in parts if isinstance(part, str) and part)
 
-    if not messages:
-        raise ValueError("Could not extract conversation data from the page")
+        if text.strip():
+            messages.append(Message(role=role, content=text.strip()))
 
     return messages
 
 
+def extract_messages_from_share_page(html_content: str) -> List[Message]:
+    """
+    Extract conversation messages from the JSON data embedded in a ChatGPT share page's HTML.
+
+    Args:
+        html_content: HTML of the share page, static or rendered
+
+    Returns:
+        List of Message objects (empty if the page embeds no conversation data)
+    """
+    # Pull the JSON out with a regex instead of parsing the whole document
+    for match in _JSON_SCRIPT_RE.finditer(html_content):
+        try:
+            messages = extract_messages_from_share_data(json_loads(match.group(1)))
+        except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
+            continue
+        if messages:
+            return messages
+    return []
+
+
+def fetch_chatgpt_static(url: str) -> Tuple[str, List[Message]]:
+    """
+    Fetch a ChatGPT share page over plain HTTP and read the conversation from its embedded JSON.
+
+    ChatGPT share pages ship the whole conversation as JSON in the initial HTML, so when that
+    data is present no browser is needed.
+
+    Args:
+        url: Shared conversation URL from chatgpt.com/share/
+
+    Returns:
+        Tuple of the page HTML and the extracted messages
+
+    Raises:
+        OSError, http.client.HTTPException: If the request fails
+        LookupError: If the response declares an unknown charset
+        ValueError: If the page does not embed the conversation
+    """
+    request = urllib.request.Request(
+        url,
+        headers={
+            "User-Agent": _BROWSER_USER_AGENTS["chromium"],
+            "Accept": "text/html,application/xhtml+xml",
+            "Accept-Language": "en-US,en;q=0.5",
+        },
+    )
+    with urllib.request.urlopen(request, timeout=15) as response:
+        html_content = response.read().decode(response.headers.get_content_charset() or "utf-8", errors="replace")
+
+    messages = extract_messages_from_share_page(html_content)
+    if not messages:
+        raise ValueError("Share page does not embed the conversation data")
+    return html_content, messages
+
+
 def detect_platform(url: str) -> str:
     """
     Detect which platform the URL is from.
@@ -431,108 +669,68 @@ def detect_platform(url: str) -> str:
         raise ValueError("URL must be from chatgpt.com/share/, claude.ai/share/, or grok.com/share/")
 
 
-def fetch_conversation(url: str) -> List[Message]:
+def _cache_path(url: str) -> pathlib.Path:
     """
-    Fetch and parse a shared conversation from ChatGPT, Claude, or Grok using Playwright.
+    Get the on-disk cache location for a conversation URL's rendered HTML.
 
     Args:
-        url: Shared conversation URL from chatgpt.com/share/, claude.ai/share/, or grok.com/share/
+        url: The conversation URL
 
     Returns:
-        List of Message objects
+        Path of the cache file (which may not exist yet)
+    """
+    return _CACHE_DIR / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.html"
 
-    Raises:
-        PlaywrightTimeout: If the page load times out
-        ValueError: If conversation cannot be parsed or URL is invalid
+
+def read_cached_html(url: str, ttl: float) -> Optional[str]:
     """
-    # Ensure Firefox is installed before attempting to use it
-    ensure_firefox_installed()
+    Read a previously rendered page from the on-disk cache.
 
-    platform = detect_platform(url)
+    Args:
+        url: The conversation URL
+        ttl: Maximum age of the cache entry in seconds
 
-    with sync_playwright() as p:
-        # Use Firefox with stealth configuration for all platforms
-        browser = p.firefox.launch(
-            headless=True,
-            firefox_user_prefs={
-                "dom.webdriver.enabled": False,
-                "useAutomationExtension": False,
-            },
-        )
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:133.0) Gecko/20100101 Firefox/133.0",
-            viewport={"width": 1920, "height": 1080},
-            locale="en-US",
-            timezone_id="America/New_York",
-            extra_http_headers={
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate, br",
-                "DNT": "1",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1",
-                "Sec-Fetch-Dest": "document",
-                "Sec-Fetch-Mode": "navigate",
-                "Sec-Fetch-Site": "none",
-                "Sec-Fetch-User": "?1",
-            },
-        )
-        page = context.new_page()
+    Returns:
+        Cached HTML content, or None if missing, expired, or unreadable
+    """
+    path = _cache_path(url)
+    try:
+        if time.time() - path.stat().st_mtime >= ttl:
+            return None
+        return path.read_text(encoding="utf-8")
+    except OSError:
+        return None
 
-        # Add stealth script to mask automation
-        page.add_init_script(
-            """
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-        """
-        )
 
-        try:
-            page.goto(url, timeout=60000, wait_until="networkidle")
-
-            # Wait for content based on platform
-            if platform == "chatgpt":
-                page.wait_for_selector('[data-testid*="conversation"]', timeout=10000)
-            elif platform == "grok":
-                # Wait for Grok content to load
-                page.wait_for_timeout(3000)
-            else:  # claude
-                # Check if we hit a Cloudflare challenge
-                try:
-                    page.wait_for_selector('text="Just a moment"', timeout=2000)
-                    print("⚠️  Cloudflare challenge detected, waiting up to 30s for it to complete...", file=sys.stderr)
-
-                    # Wait for challenge to complete (up to 30 seconds)
-                    for i in range(30):
-                        page.wait_for_timeout(1000)
-                        current_url = page.url
-                        content = page.content()
-
-                        # Check if we've passed the challenge
-                        if "Just a moment" not in content and "claude.ai" in current_url:
-                            print(f"✓ Cloudflare challenge passed after {i+1}s", file=sys.stderr)
-                            break
-
-                        if i == 29:
-                            raise ValueError(
-                                "Cloudflare challenge did not complete. "
-                                "Claude.ai is blocking automated access. "
-                                "Try accessing the URL in a regular browser first."
-                            )
-                except PlaywrightTimeout:
-                    # No Cloudflare challenge detected, continue normally
-                    pass
-
-                # Wait additional time for content to load
-                page.wait_for_timeout(3000)
-
-            html_content = page.content()
+def write_cached_html(url: str, html_content: str) -> None:
+    """
+    Store a rendered page in the on-disk cache. Failures are ignored.
 
-        finally:
-            browser.close()
+    Args:
+        url: The conversation URL
+        html_content: Rendered HTML content of the page
+    """
+    try:
+        _CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        _cache_path(url).write_text(html_content, encoding="utf-8")
+    except OSError:
+        pass  # The cache is an optimization only
+
+
+def extract_messages(html_content: str, platform: str) -> List[Message]:
+    """
+    Extract conversation messages using the platform-specific extractor.
+
+    Args:
+        html_content: Rendered HTML content from the shared conversation page
+        platform: Platform name as returned by detect_platform
+
+    Returns:
+        List of Message objects representing the conversation
 
-    # Extract messages based on platform
+    Raises:
+        ValueError: If conversation data cannot be extracted
+    """
     if platform == "chatgpt":
         return extract_conversation_from_html(html_content)
     elif platform == "claude":
@@ -541,329 +739,693 @@ def fetch_conversation(url: str) -> List[Message]:
         return extract_grok_conversation(html_content)
 
 
-def render_markdown_with_code(text: str) -> str:
+def fetch_conversation_without_browser(url: str, platform: str, cache_ttl: float) -> Optional[List[Message]]:
     """
-    Render markdown text with syntax-highlighted code blocks.
+    Try to get a conversation from the on-disk cache or, for ChatGPT, from the static page.
 
     Args:
-        text: Markdown text to render
+        url: Shared conversation URL
+        platform: Platform name as returned by detect_platform
+        cache_ttl: Maximum age in seconds of a cached page to reuse (0 disables the cache)
 
     Returns:
-        HTML string with rendered markdown and highlighted code
+        List of Message objects, or None if a browser is needed
     """
-    from pygments import highlight
-    from pygments.formatters import HtmlFormatter
-    from pygments.lexers import TextLexer, get_lexer_by_name, guess_lexer
-
-    # First, render markdown with fenced code blocks
-    html_content = markdown.markdown(
-        text,
-        extensions=["fenced_code", "tables", "nl2br", "sane_lists"],
-    )
-
-    # Post-process to add syntax highlighting to code blocks
-    soup = BeautifulSoup(html_content, "html.parser")
-
-    for code_block in soup.find_all("code"):
-        # Skip inline code (code without pre parent)
-        if not code_block.parent or code_block.parent.name != "pre":
-            continue
-
-        code_text = code_block.get_text()
-        # Try to detect language from class attribute
-        classes = code_block.get("class", [])
-        language = None
-
-        for cls in classes:
-            if cls.startswith("language-"):
-                language = cls.replace("language-", "")
-                break
+    if cache_ttl > 0:
+        html_content = read_cached_html(url, cache_ttl)
+        if html_content is not None:
+            # A corrupt or outdated entry is treated as a cache miss
+            try:
+                messages = extract_messages(html_content, platform)
+            except ValueError:
+                messages = None
+            if messages is not None:
+                print("⚡ Using cached copy of the page", file=sys.stderr)
+                return messages
 
-        # Highlight the code
+    if platform == "chatgpt":
+        # The conversation is usually embedded in the static page; only launch a browser if it isn't
         try:
-            if language:
-                lexer = get_lexer_by_name(language, stripall=False)
-            else:
-                lexer = guess_lexer(code_text)
-        except Exception:
-            lexer = TextLexer(stripall=False)
-
-        formatter = HtmlFormatter(nowrap=False, cssclass="highlight")
-        highlighted = highlight(code_text, lexer, formatter)
+            html_content, messages = fetch_chatgpt_static(url)
+        except (OSError, ValueError, LookupError, http.client.HTTPException):
+            return None
+        if cache_ttl > 0:
+            write_cached_html(url, html_content)
+        return messages
 
-        # Replace the pre>code block with highlighted version
-        highlighted_soup = BeautifulSoup(highlighted, "html.parser")
-        code_block.parent.replace_with(highlighted_soup)
+    return None
 
-    return str(soup)
 
-
-def count_turns(messages: List[Message]) -> int:
+def fetch_conversation(url: str, cache_ttl: float = DEFAULT_CACHE_TTL) -> List[Message]:
     """
-    Count the number of conversation turns (user-assistant pairs).
+    Fetch and parse a shared conversation from ChatGPT, Claude, or Grok.
 
-    A turn is defined as a user message followed by one or more assistant messages.
+    The rendered page is cached on disk so repeat runs within cache_ttl skip the browser entirely.
+    To fetch several conversations with one browser, use ConversationFetcher directly.
 
     Args:
-        messages: List of conversation messages
+        url: Shared conversation URL from chatgpt.com/share/, claude.ai/share/, or grok.com/share/
+        cache_ttl: Maximum age in seconds of a cached page to reuse (0 disables the cache)
 
     Returns:
-        Number of complete turns in the conversation
+        List of Message objects
+
+    Raises:
+        PlaywrightTimeout: If the page load times out
+        ValueError: If conversation cannot be parsed or URL is invalid
     """
-    turns = 0
-    i = 0
-    while i < len(messages):
-        # Look for user message
-        if messages[i].role == "user":
-            # Count this as a turn
-            turns += 1
-            i += 1
-            # Skip any following assistant messages (they're part of this turn)
-            while i < len(messages) and messages[i].role == "assistant":
-                i += 1
-        else:
-            # Skip assistant messages without a preceding user message
-            i += 1
-    return turns
+    with ConversationFetcher(cache_ttl=cache_ttl) as fetcher:
+        return fetcher.fetch(url)
 
 
-def filter_last_turns(messages: List[Message], n_turns: int) -> List[Message]:
+class ConversationFetcher:
     """
-    Filter messages to keep only the last N conversation turns.
+    Fetches shared conversations while reusing one headless browser per engine.
 
-    Args:
-        messages: List of all conversation messages
-        n_turns: Number of turns to keep from the end
+    Launching a browser is the dominant cost of a fetch, so the browser, context, and page are
+    started lazily on first use and kept open until close(). Use as a context manager:
 
-    Returns:
-        Filtered list containing last N turns
+        with ConversationFetcher() as fetcher:
+            for url in urls:
+                messages = fetcher.fetch(url)
 
-    Raises:
-        ValueError: If n_turns is invalid
+    Attributes:
+        cache_ttl: Maximum age in seconds of a cached page to reuse (0 disables the cache)
     """
-    total_turns = count_turns(messages)
-    assert n_turns > 0, "Number of turns must be positive"
-    assert n_turns <= total_turns, f"Requested {n_turns} turns but conversation only has {total_turns} turns"
 
-    # Find the starting index for the last N turns
-    turns_seen = 0
-    start_idx = 0
+    def __init__(self, cache_ttl: float = DEFAULT_CACHE_TTL) -> None:
+        self.cache_ttl = cache_ttl
+        self._pw: Optional[Playwright] = None
+        self._browsers: Dict[str, Browser] = {}
+        self._pages: Dict[str, Page] = {}
 
-    for i in range(len(messages) - 1, -1, -1):
-        if messages[i].role == "user":
-            turns_seen += 1
-            if turns_seen == n_turns:
-                # Found the start of the Nth turn from the end
-                start_idx = i
-                break
+    def __enter__(self) -> ConversationFetcher:
+        return self
 
-    return messages[start_idx:]
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
+    def close(self) -> None:
+        """
+        Close every launched browser and stop Playwright.
+        """
+        for browser in self._browsers.values():
+            browser.close()
+        self._browsers.clear()
+        self._pages.clear()
+        if self._pw is not None:
+            self._pw.stop()
+            self._pw = None
 
-def generate_xml_text(messages: List[Message]) -> str:
-    """
-    Generate XML format text for LLM consumption.
+    def fetch(self, url: str) -> List[Message]:
+        """
+        Fetch and parse a shared conversation, using the on-disk cache when possible.
 
-    Args:
-        messages: List of conversation messages
+        Args:
+            url: Shared conversation URL from chatgpt.com/share/, claude.ai/share/, or grok.com/share/
 
-    Returns:
-        XML-formatted string representation of the conversation
-    """
-    lines = ["<conversation>"]
+        Returns:
+            List of Message objects
 
-    for idx, msg in enumerate(messages, 1):
-        lines.append(f'  <message index="{idx}" role="{msg.role}">')
-        lines.append("    <content>")
-        # Content will be escaped in the HTML template, not here
-        lines.append(f"      {msg.content}")
-        lines.append("    </content>")
-        lines.append("  </message>")
+        Raises:
+            PlaywrightTimeout: If the page load times out
+            ValueError: If conversation cannot be parsed or URL is invalid
+        """
+        platform = detect_platform(url)
 
-    lines.append("</conversation>")
-    return "\n".join(lines)
+        messages = fetch_conversation_without_browser(url, platform, self.cache_ttl)
+        if messages is not None:
+            return messages
 
+        html_content = self.fetch_page_html(url, platform)
+        messages = extract_messages(html_content, platform)
 
-def build_html(url: str, messages: List[Message], platform_name: str = "ChatGPT") -> str:
-    """
-    Build the complete HTML page with conversation content.
+        # Only cache pages that produced a conversation (not e.g. a Cloudflare challenge)
+        if self.cache_ttl > 0:
+            write_cached_html(url, html_content)
 
-    Args:
-        url: The source URL of the conversation
-        messages: List of conversation messages
-        platform_name: Name of the platform ("ChatGPT" or "Claude")
+        return messages
 
-    Returns:
-        Complete HTML string ready to be written to file
-    """
-    from pygments.formatters import HtmlFormatter
+    def fetch_page_html(self, url: str, platform: str) -> str:
+        """
+        Load a shared conversation page in the headless browser for its platform.
 
-    # Generate XML text for LLM view
-    xml_text = generate_xml_text(messages)
+        Args:
+            url: Shared conversation URL
+            platform: Platform name as returned by detect_platform
 
-    # Generate XML for different turn counts for the dropdown
-    total_turns = count_turns(messages)
-    xml_data_by_turns = {"all": xml_text}
-    turn_options = []
+        Returns:
+            Rendered HTML content of the page
 
-    for n in range(1, min(total_turns + 1, 11)):  # Limit to max 10 turn options
-        filtered_messages = filter_last_turns(messages, n)
-        xml_for_n_turns = generate_xml_text(filtered_messages)
-        xml_data_by_turns[str(n)] = xml_for_n_turns
-        turn_options.append((n, len(filtered_messages)))
+        Raises:
+            PlaywrightTimeout: If the page load times out
+            ValueError: If Claude's Cloudflare challenge does not complete
+        """
+        page = self._get_page(_PLATFORM_BROWSERS[platform])
+        content_selector, timeout = _PLATFORM_CONTENT_WAITS[platform]
+
+        # Don't wait for network idle (CDN-heavy pages keep loading long after the conversation
+        # is in the DOM); wait for a platform-specific selector instead
+        page.goto(url, timeout=_PAGE_LOAD_TIMEOUT, wait_until="domcontentloaded")
+
+        # Wait for either the conversation or a Cloudflare challenge, whichever shows up first
+        page.locator(content_selector).or_(page.locator(_CLOUDFLARE_CHALLENGE_SELECTOR)).first.wait_for(timeout=timeout)
+        if page.locator(content_selector).count() == 0:
+            print(_CLOUDFLARE_DETECTED_MESSAGE, file=sys.stderr)
+            started = time.monotonic()
+            try:
+                page.wait_for_selector(content_selector, timeout=_CLOUDFLARE_CHALLENGE_TIMEOUT)
+            except PlaywrightTimeout:
+                raise ValueError(_CLOUDFLARE_BLOCKED_MESSAGE) from None
+            print(f"✓ Cloudflare challenge passed after {time.monotonic() - started:.0f}s", file=sys.stderr)
 
-    # Create JavaScript object with escaped XML strings
-    xml_data_json = json.dumps(xml_data_by_turns)
+        return page.content()
 
-    # Check if conversation contains attachment references
-    has_attachments = any(
-        "attachment hidden" in msg.content.lower() or "files hidden" in msg.content.lower() for msg in messages
-    )
+    def _get_page(self, browser_name: str) -> Page:
+        """
+        Get the page for a browser engine, launching the browser on first use.
 
-    # Build attachment warning if needed
-    attachment_warning = ""
-    if has_attachments:
-        attachment_warning = """
-        <div style="background: #fff3cd; border-left: 4px solid #ffc107; padding: 1rem; margin-bottom: 1rem; border-radius: 4px;">
-          <strong>⚠️ Note:</strong> This conversation referenced attachments (images/PDFs) that are not included in shared links for privacy/security reasons.
-        </div>
+        Args:
+            browser_name: Playwright browser to use ('chromium' or 'firefox')
+
+        Returns:
+            Page with the stealth configuration applied
         """
+        if browser_name in self._pages:
+            return self._pages[browser_name]
 
-    # Generate Pygments CSS for code highlighting
-    formatter = HtmlFormatter(nowrap=False)
-    pygments_css = formatter.get_style_defs(".highlight")
+        if self._pw is None:
+            self._pw = sync_playwright().start()
 
-    # Build navigation sidebar
-    nav_items = []
-    for idx, msg in enumerate(messages, 1):
-        role_emoji = "👤" if msg.role == "user" else "🤖"
-        # Get first line or first 60 chars as preview
-        preview = msg.content.split("\n")[0][:60]
-        if len(msg.content.split("\n")[0]) > 60 or len(msg.content.split("\n")) > 1:
-            preview += "..."
+        # Ensure the browser is installed before attempting to use it
+        ensure_browser_installed(browser_name, self._pw)
 
-        nav_items.append(
-            f'<li><a href="#msg-{idx}">{role_emoji} Message {idx}</a>'
-            f'<div class="nav-preview">{html.escape(preview)}</div></li>'
-        )
+        # Launch with stealth configuration to mask automation
+        browser = getattr(self._pw, browser_name).launch(**_BROWSER_LAUNCH_OPTIONS[browser_name])
+        self._browsers[browser_name] = browser
 
-    nav_html = "\n".join(nav_items)
+        context = browser.new_context(user_agent=_BROWSER_USER_AGENTS[browser_name], **_BROWSER_CONTEXT_OPTIONS)
+        page = context.new_page()
 
-    # Build conversation HTML for human view with markdown rendering
-    conversation_html = []
-    for idx, msg in enumerate(messages, 1):
-        role_class = "user" if msg.role == "user" else "assistant"
-        role_label = "👤 User" if msg.role == "user" else "🤖 Assistant"
+        # Add stealth script to mask automation
+        page.add_init_script(_STEALTH_SCRIPT)
 
-        # Render markdown content
-        content_html = render_markdown_with_code(msg.content)
+        self._pages[browser_name] = page
+        return page
 
-        conversation_html.append(
-            f"""
-<div class="message {role_class}" id="msg-{idx}">
-  <div class="message-header">{role_label} <span class="message-number">#{idx}</span></div>
-  <div class="message-content">{content_html}</div>
-  <div class="back-top"><a href="#top">↑ Back to top</a></div>
-</div>
-"""
-        )
 
-    conversation_section = "".join(conversation_html)
+async def fetch_conversations_async(
+    urls: List[str], concurrency: int = 4, cache_ttl: float = DEFAULT_CACHE_TTL
+) -> List[List[Message]]:
+    """
+    Fetch and parse several shared conversations concurrently.
 
-    # Complete HTML document
-    return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="utf-8" />
-<meta name="viewport" content="width=device-width, initial-scale=1" />
-<title>{platform_name} Conversation – {html.escape(url)}</title>
-<style>
-  body {{
+    All URLs share one browser per engine with up to `concurrency` pages loading at once,
+    so network waits overlap instead of adding up. Pages found in the on-disk cache, or
+    ChatGPT conversations embedded in the static page, never touch the browser.
+
+    Args:
+        urls: Shared conversation URLs from chatgpt.com/share/, claude.ai/share/, or grok.com/share/
+        concurrency: Maximum number of conversations fetched at the same time
+        cache_ttl: Maximum age in seconds of a cached page to reuse (0 disables the cache)
+
+    Returns:
+        List of Message lists, in the same order as urls
+
+    Raises:
+        PlaywrightTimeout: If a page load times out
+        ValueError: If a conversation cannot be parsed or a URL is invalid
+    """
+    from playwright.async_api import async_playwright
+
+    platforms = [detect_platform(url) for url in urls]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with async_playwright() as p:
+        # Browser contexts are opened on first use and shared by every fetch for that engine
+        contexts: Dict[str, asyncio.Future] = {}
+
+        async def open_context(browser_name: str) -> AsyncBrowserContext:
+            # The install check uses the sync API, which cannot run inside the event loop
+            await asyncio.to_thread(ensure_browser_installed, browser_name)
+            browser = await getattr(p, browser_name).launch(**_BROWSER_LAUNCH_OPTIONS[browser_name])
+            context = await browser.new_context(
+                user_agent=_BROWSER_USER_AGENTS[browser_name], **_BROWSER_CONTEXT_OPTIONS
+            )
+            await context.add_init_script(_STEALTH_SCRIPT)
+            return context
+
+        async def fetch_one(url: str, platform: str) -> List[Message]:
+            async with semaphore:
+                messages = await asyncio.to_thread(fetch_conversation_without_browser, url, platform, cache_ttl)
+                if messages is not None:
+                    return messages
+
+                browser_name = _PLATFORM_BROWSERS[platform]
+                if browser_name not in contexts:
+                    contexts[browser_name] = asyncio.ensure_future(open_context(browser_name))
+                context = await contexts[browser_name]
+
+                page = await context.new_page()
+                try:
+                    html_content = await load_page_html_async(page, url, platform)
+                finally:
+                    await page.close()
+
+            messages = extract_messages(html_content, platform)
+            if cache_ttl > 0:
+                write_cached_html(url, html_content)
+            return messages
+
+        tasks = [asyncio.ensure_future(fetch_one(url, platform)) for url, platform in zip(urls, platforms)]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            # Stop the other fetches before their browsers are closed below
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            for future in contexts.values():
+                future.cancel()
+            await asyncio.gather(*contexts.values(), return_exceptions=True)
+            for future in contexts.values():
+                if not future.cancelled() and future.exception() is None:
+                    await future.result().browser.close()
+
+
+async def load_page_html_async(page: AsyncPage, url: str, platform: str) -> str:
+    """
+    Load a shared conversation page with the async Playwright API.
+
+    Mirrors ConversationFetcher.fetch_page_html.
+
+    Args:
+        page: Async Playwright page to load the conversation in
+        url: Shared conversation URL
+        platform: Platform name as returned by detect_platform
+
+    Returns:
+        Rendered HTML content of the page
+
+    Raises:
+        PlaywrightTimeout: If the page load times out
+        ValueError: If Claude's Cloudflare challenge does not complete
+    """
+    content_selector, timeout = _PLATFORM_CONTENT_WAITS[platform]
+    await page.goto(url, timeout=_PAGE_LOAD_TIMEOUT, wait_until="domcontentloaded")
+
+    # Wait for either the conversation or a Cloudflare challenge, whichever shows up first
+    await page.locator(content_selector).or_(page.locator(_CLOUDFLARE_CHALLENGE_SELECTOR)).first.wait_for(
+        timeout=timeout
+    )
+    if await page.locator(content_selector).count() == 0:
+        print(_CLOUDFLARE_DETECTED_MESSAGE, file=sys.stderr)
+        started = time.monotonic()
+        try:
+            await page.wait_for_selector(content_selector, timeout=_CLOUDFLARE_CHALLENGE_TIMEOUT)
+        except PlaywrightTimeout:
+            raise ValueError(_CLOUDFLARE_BLOCKED_MESSAGE) from None
+        print(f"✓ Cloudflare challenge passed after {time.monotonic() - started:.0f}s", file=sys.stderr)
+
+    return await page.content()
+
+
+@lru_cache(maxsize=32)
+def _get_lexer(language: str) -> Optional[Lexer]:
+    """
+    Get a Pygments lexer by language name, cached across code blocks.
+
+    Args:
+        language: Language name or alias (e.g. 'python', 'js')
+
+    Returns:
+        Matching lexer, or None if the language is unknown or plain text
+    """
+    from pygments.lexers import TextLexer, get_lexer_by_name
+
+    try:
+        lexer = get_lexer_by_name(language, stripall=False)
+    except Exception:
+        return None
+    return None if isinstance(lexer, TextLexer) else lexer
+
+
+def _plain_code_html(code: str) -> str:
+    """
+    Render a code block without highlighting, in the same markup Pygments produces for plain text.
+
+    Args:
+        code: Code block text
+
+    Returns:
+        HTML string for the code block
+    """
+    code = code.replace("\r\n", "\n").replace("\r", "\n").strip("\n")
+    return f'<div class="highlight"><pre><span></span>{html.escape(code, quote=False)}\n</pre></div>\n'
+
+
+def _markdown_converter() -> markdown.Markdown:
+    """
+    Get the Markdown converter used for message content, built once per thread.
+
+    Building a converter sets up its whole extension pipeline, so one instance is reused
+    across messages and reset before each conversion. Converters are stateful, so each
+    thread gets its own and concurrent renders can't interleave.
+
+    Returns:
+        Markdown converter with the message extensions loaded
+    """
+    converter = getattr(_MARKDOWN_THREAD_STATE, "converter", None)
+    if converter is None:
+        converter = _MARKDOWN_THREAD_STATE.converter = markdown.Markdown(extensions=_MARKDOWN_EXTENSIONS)
+    return converter
+
+
+def render_markdown_with_code(text: str) -> str:
+    """
+    Render markdown text with syntax-highlighted code blocks.
+
+    Args:
+        text: Markdown text to render
+
+    Returns:
+        HTML string with rendered markdown and highlighted code
+    """
+    from pygments import highlight
+    from pygments.formatters import HtmlFormatter
+
+    # First, render markdown with fenced code blocks
+    html_content = _markdown_converter().reset().convert(text)
+
+    # Post-process to add syntax highlighting to code blocks
+    soup = BeautifulSoup(html_content, "html.parser")
+    formatter = HtmlFormatter(nowrap=False, cssclass="highlight")
+    highlighted_blocks = []
+    # Markdown passes raw HTML comments through, so placeholders carry a per-call nonce that message text can't match
+    placeholder_prefix = f"{_CODE_PLACEHOLDER_PREFIX}{secrets.token_hex(8)}-"
+
+    for code_block in soup.find_all("code"):
+        # Skip inline code (code without pre parent)
+        if not code_block.parent or code_block.parent.name != "pre":
+            continue
+
+        code_text = code_block.get_text()
+        # Try to detect language from class attribute
+        classes = code_block.get("class", [])
+        language = None
+
+        for cls in classes:
+            if cls.startswith("language-"):
+                language = cls.replace("language-", "")
+                break
+
+        # Highlight the code; unlabelled, unknown-language, and very large blocks skip Pygments
+        # and are rendered as escaped plain text
+        lexer = _get_lexer(language) if language and len(code_text) <= _HIGHLIGHT_MAX_CHARS else None
+        if lexer is None:
+            highlighted_blocks.append(_plain_code_html(code_text))
+        else:
+            highlighted_blocks.append(highlight(code_text, lexer, formatter))
+
+        # Stand in a placeholder comment for the pre>code block; the highlighted HTML
+        # is spliced in after serialization instead of being parsed back into the tree
+        code_block.parent.replace_with(Comment(f"{placeholder_prefix}{len(highlighted_blocks) - 1}"))
+
+    if not highlighted_blocks:
+        return str(soup)
+
+    def splice(match: re.Match) -> str:
+        idx = int(match.group(1))
+        return highlighted_blocks[idx] if idx < len(highlighted_blocks) else match.group(0)
+
+    return re.sub(rf"<!--{placeholder_prefix}(\d+)-->", splice, str(soup))
+
+
+def _warm_up_rendering() -> None:
+    """
+    Import and build the rendering machinery ahead of time.
+
+    Run in a background thread while the conversation is being fetched, so the Pygments
+    stylesheet and the markdown extension imports are ready by the time the page is built.
+    """
+    _pygments_css()
+    _get_lexer("python")
+    # Loads the extension modules; the converter itself belongs to this thread and is not reused
+    markdown.Markdown(extensions=_MARKDOWN_EXTENSIONS)
+
+
+def user_message_indices(messages: List[Message]) -> List[int]:
+    """
+    Find the position of every user message in the conversation.
+
+    Each user message starts a new turn, so this list both counts the turns and gives
+    the start index of the last N turns as ``indices[-n]``.
+
+    Args:
+        messages: List of conversation messages
+
+    Returns:
+        Indices of user messages, in conversation order
+    """
+    return [i for i, msg in enumerate(messages) if msg.role == "user"]
+
+
+def count_turns(messages: List[Message]) -> int:
+    """
+    Count the number of conversation turns (user-assistant pairs).
+
+    A turn is defined as a user message followed by one or more assistant messages.
+    Assistant messages without a preceding user message do not start a turn.
+
+    Args:
+        messages: List of conversation messages
+
+    Returns:
+        Number of complete turns in the conversation
+    """
+    return sum(1 for msg in messages if msg.role == "user")
+
+
+def filter_last_turns(messages: List[Message], n_turns: int) -> List[Message]:
+    """
+    Filter messages to keep only the last N conversation turns.
+
+    Args:
+        messages: List of all conversation messages
+        n_turns: Number of turns to keep from the end
+
+    Returns:
+        Filtered list containing last N turns
+
+    Raises:
+        ValueError: If n_turns is invalid
+    """
+    user_indices = user_message_indices(messages)
+    total_turns = len(user_indices)
+    assert n_turns > 0, "Number of turns must be positive"
+    assert n_turns <= total_turns, f"Requested {n_turns} turns but conversation only has {total_turns} turns"
+
+    return messages[user_indices[-n_turns] :]
+
+
+def xml_message_fragments(messages: List[Message]) -> List[str]:
+    """
+    Serialize each message to its XML element, without the leading index attribute.
+
+    The index is left out so the same fragments can be joined for any slice of the
+    conversation with indices renumbered from 1 (see join_xml_fragments).
+
+    Args:
+        messages: List of conversation messages
+
+    Returns:
+        One XML fragment per message
+    """
+    # Content will be escaped in the HTML template, not here
+    return [
+        f' role="{msg.role}">\n    <content>\n      {msg.content}\n    </content>\n  </message>' for msg in messages
+    ]
+
+
+def xml_document_parts(fragments: List[str]) -> List[str]:
+    """
+    Build the pieces of a complete conversation document from per-message XML fragments.
+
+    Concatenating the pieces gives the document; they can also be written to a file one by one.
+
+    Args:
+        fragments: Fragments produced by xml_message_fragments
+
+    Returns:
+        Document pieces: the root tag, one string per message, and the closing tag
+    """
+    # One string per message joined once (measured faster than writing to an io.StringIO)
+    parts = ["<conversation>"]
+    parts.extend(f'\n  <message index="{idx}"{fragment}' for idx, fragment in enumerate(fragments, 1))
+    parts.append("\n</conversation>")
+    return parts
+
+
+def join_xml_fragments(fragments: List[str]) -> str:
+    """
+    Join per-message XML fragments into a complete conversation document.
+
+    Args:
+        fragments: Fragments produced by xml_message_fragments
+
+    Returns:
+        XML-formatted string representation of the conversation
+    """
+    return "".join(xml_document_parts(fragments))
+
+
+def _json_escaped_xml_document(escaped_fragments: List[str]) -> str:
+    """
+    Join individually JSON-escaped message fragments into the body of a JSON string.
+
+    The result equals the JSON-escaped output of join_xml_fragments on the unescaped fragments
+    (without the surrounding quotes), so overlapping documents can share the escaping work.
+
+    Args:
+        escaped_fragments: Fragments from xml_message_fragments, each JSON-escaped without quotes
+
+    Returns:
+        JSON-escaped XML document
+    """
+    parts = ["<conversation>"]
+    parts.extend(f'\\n  <message index=\\"{idx}\\"{fragment}' for idx, fragment in enumerate(escaped_fragments, 1))
+    parts.append("\\n</conversation>")
+    return "".join(parts)
+
+
+def generate_xml_text(messages: List[Message]) -> str:
+    """
+    Generate XML format text for LLM consumption.
+
+    Args:
+        messages: List of conversation messages
+
+    Returns:
+        XML-formatted string representation of the conversation
+    """
+    return join_xml_fragments(xml_message_fragments(messages))
+
+
+@lru_cache(maxsize=4)
+def _pygments_css(style: str = "default") -> str:
+    """
+    Build the Pygments CSS for highlighted code blocks, cached per style.
+
+    Args:
+        style: Pygments style name
+
+    Returns:
+        CSS rules scoped to the .highlight class
+    """
+    from pygments.formatters import HtmlFormatter
+
+    return HtmlFormatter(style=style).get_style_defs(".highlight")
+
+
+# Output files are written piece by piece through a large buffer instead of as one joined string
+_WRITE_BUFFER_SIZE = 1 << 19
+
+# Static parts of the page built by build_html
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8" />
+<meta name="viewport" content="width=device-width, initial-scale=1" />
+"""
+_HTML_STYLE = """<style>
+  body {
     font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, 'Apple Color Emoji','Segoe UI Emoji';
     margin: 0; padding: 0; line-height: 1.6;
     background: #f8f9fa;
-  }}
+  }
 
   /* Layout with sidebar */
-  .page {{ display: grid; grid-template-columns: 280px minmax(0,1fr); gap: 0; }}
+  .page { display: grid; grid-template-columns: 280px minmax(0,1fr); gap: 0; }
 
-  #sidebar {{
+  #sidebar {
     position: sticky; top: 0; align-self: start;
     height: 100vh; overflow: auto;
     border-right: 1px solid #e1e4e8; background: #ffffff;
     box-shadow: 2px 0 4px rgba(0,0,0,0.05);
-  }}
-  #sidebar .sidebar-inner {{ padding: 1rem; }}
-  #sidebar h2 {{ margin: 0 0 1rem 0; font-size: 1rem; color: #24292e; }}
+  }
+  #sidebar .sidebar-inner { padding: 1rem; }
+  #sidebar h2 { margin: 0 0 1rem 0; font-size: 1rem; color: #24292e; }
 
-  .nav-list {{
+  .nav-list {
     list-style: none; padding: 0; margin: 0;
-  }}
-  .nav-list li {{
+  }
+  .nav-list li {
     margin-bottom: 0.75rem;
     padding-bottom: 0.75rem;
     border-bottom: 1px solid #f0f0f0;
-  }}
-  .nav-list li:last-child {{ border-bottom: none; }}
-  .nav-list a {{
+  }
+  .nav-list li:last-child { border-bottom: none; }
+  .nav-list a {
     text-decoration: none; color: #0366d6;
     font-weight: 500;
     display: block;
-  }}
-  .nav-list a:hover {{ text-decoration: underline; }}
-  .nav-preview {{
+  }
+  .nav-list a:hover { text-decoration: underline; }
+  .nav-preview {
     font-size: 0.85rem;
     color: #586069;
     margin-top: 0.25rem;
     line-height: 1.4;
-  }}
+  }
 
-  main.container {{
+  main.container {
     padding: 1rem 2rem;
     max-width: 1000px;
-  }}
+  }
 
-  @media (max-width: 900px) {{
-    .page {{ grid-template-columns: 1fr; }}
-    #sidebar {{
+  @media (max-width: 900px) {
+    .page { grid-template-columns: 1fr; }
+    #sidebar {
       position: relative;
       height: auto;
       border-right: none;
       border-bottom: 1px solid #e1e4e8;
-    }}
-  }}
+    }
+  }
 
-  .header {{
+  .header {
     background: white;
     padding: 1.5rem;
     margin-bottom: 1.5rem;
     border-radius: 8px;
     box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-  }}
-  .header h1 {{
+  }
+  .header h1 {
     margin: 0 0 0.5rem 0;
     font-size: 1.5rem;
     color: #24292e;
-  }}
-  .meta {{
+  }
+  .meta {
     color: #586069;
     font-size: 0.9rem;
-  }}
-  .meta a {{
+  }
+  .meta a {
     color: #0366d6;
     text-decoration: none;
-  }}
-  .meta a:hover {{
+  }
+  .meta a:hover {
     text-decoration: underline;
-  }}
-  .stats {{
+  }
+  .stats {
     margin-top: 0.5rem;
     color: #586069;
     font-size: 0.85rem;
-  }}
+  }
 
   /* View toggle */
-  .view-toggle {{
+  .view-toggle {
     display: flex;
     gap: 0.5rem;
     align-items: center;
@@ -872,8 +1434,8 @@ def build_html(url: str, messages: List[Message], platform_name: str = "ChatGPT"
     background: white;
     border-radius: 8px;
     box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-  }}
-  .toggle-btn {{
+  }
+  .toggle-btn {
     padding: 0.5rem 1rem;
     border: 1px solid #dadce0;
     background: white;
@@ -881,36 +1443,36 @@ def build_html(url: str, messages: List[Message], platform_name: str = "ChatGPT"
     border-radius: 6px;
     font-size: 0.9rem;
     transition: all 0.2s;
-  }}
-  .toggle-btn.active {{
+  }
+  .toggle-btn.active {
     background: #1a73e8;
     color: white;
     border-color: #1a73e8;
-  }}
-  .toggle-btn:hover:not(.active) {{
+  }
+  .toggle-btn:hover:not(.active) {
     background: #f8f9fa;
     border-color: #1a73e8;
-  }}
+  }
 
   /* Human view */
-  #human-view {{
+  #human-view {
     display: block;
-  }}
-  .message {{
+  }
+  .message {
     background: white;
     margin-bottom: 1.5rem;
     padding: 1.5rem;
     border-radius: 8px;
     box-shadow: 0 1px 3px rgba(0,0,0,0.1);
     scroll-margin-top: 1rem;
-  }}
-  .message.user {{
+  }
+  .message.user {
     border-left: 4px solid #0366d6;
-  }}
-  .message.assistant {{
+  }
+  .message.assistant {
     border-left: 4px solid #28a745;
-  }}
-  .message-header {{
+  }
+  .message-header {
     font-weight: 600;
     margin-bottom: 1rem;
     color: #24292e;
@@ -918,91 +1480,91 @@ def build_html(url: str, messages: List[Message], platform_name: str = "ChatGPT"
     display: flex;
     justify-content: space-between;
     align-items: center;
-  }}
-  .message-number {{
+  }
+  .message-number {
     font-weight: normal;
     color: #6a737d;
     font-size: 0.9rem;
-  }}
-  .message-content {{
+  }
+  .message-content {
     color: #24292e;
     line-height: 1.6;
-  }}
-  .message-content p {{
+  }
+  .message-content p {
     margin: 0 0 1em 0;
-  }}
-  .message-content p:last-child {{
+  }
+  .message-content p:last-child {
     margin-bottom: 0;
-  }}
-  .message-content pre {{
+  }
+  .message-content pre {
     background: #f6f8fa;
     padding: 1rem;
     border-radius: 6px;
     overflow-x: auto;
     margin: 1em 0;
-  }}
-  .message-content code {{
+  }
+  .message-content code {
     font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, 'Courier New', monospace;
     font-size: 0.9em;
-  }}
-  .message-content pre code {{
+  }
+  .message-content pre code {
     background: none;
     padding: 0;
     border: none;
-  }}
-  .message-content :not(pre) > code {{
+  }
+  .message-content :not(pre) > code {
     background: #f6f8fa;
     padding: 0.2em 0.4em;
     border-radius: 3px;
-  }}
-  .message-content table {{
+  }
+  .message-content table {
     border-collapse: collapse;
     width: 100%;
     margin: 1em 0;
-  }}
+  }
   .message-content table th,
-  .message-content table td {{
+  .message-content table td {
     border: 1px solid #d1d5da;
     padding: 0.5rem;
-  }}
-  .message-content table th {{
+  }
+  .message-content table th {
     background: #f6f8fa;
     font-weight: 600;
-  }}
-  .back-top {{
+  }
+  .back-top {
     margin-top: 1rem;
     font-size: 0.9rem;
-  }}
-  .back-top a {{
+  }
+  .back-top a {
     color: #0366d6;
     text-decoration: none;
-  }}
-  .back-top a:hover {{
+  }
+  .back-top a:hover {
     text-decoration: underline;
-  }}
+  }
 
-  :target {{
+  :target {
     scroll-margin-top: 1rem;
-  }}
+  }
 
   /* LLM view */
-  #llm-view {{
+  #llm-view {
     display: none;
     background: white;
     padding: 1.5rem;
     border-radius: 8px;
     box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-  }}
-  #llm-view h2 {{
+  }
+  #llm-view h2 {
     margin: 0 0 1rem 0;
     font-size: 1.25rem;
     color: #202124;
-  }}
-  #llm-view p {{
+  }
+  #llm-view p {
     color: #5f6368;
     margin-bottom: 1rem;
-  }}
-  #llm-text {{
+  }
+  #llm-text {
     width: 100%;
     height: 70vh;
     font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, monospace;
@@ -1012,18 +1574,212 @@ def build_html(url: str, messages: List[Message], platform_name: str = "ChatGPT"
     padding: 1rem;
     resize: vertical;
     background: #f8f9fa;
-  }}
-  .copy-hint {{
+  }
+  .copy-hint {
     margin-top: 0.75rem;
     padding: 0.75rem;
     background: #e8f0fe;
     border-radius: 6px;
     color: #174ea6;
     font-size: 0.9em;
-  }}
+  }
 
   /* Pygments syntax highlighting */
-  {pygments_css}
+  """
+_HTML_SCRIPT = """function showHumanView(btn) {
+  document.getElementById('human-view').style.display = 'block';
+  document.getElementById('llm-view').style.display = 'none';
+  document.querySelectorAll('.toggle-btn').forEach(b => b.classList.remove('active'));
+  btn.classList.add('active');
+}
+
+function showLLMView(btn) {
+  document.getElementById('human-view').style.display = 'none';
+  document.getElementById('llm-view').style.display = 'block';
+  document.querySelectorAll('.toggle-btn').forEach(b => b.classList.remove('active'));
+  btn.classList.add('active');
+
+  // Auto-select all text when switching to LLM view for easy copying
+  setTimeout(() => {
+    const textArea = document.getElementById('llm-text');
+    textArea.focus();
+    textArea.select();
+  }, 100);
+}
+
+function updateXMLContent() {
+  const selector = document.getElementById('turn-selector');
+  const textArea = document.getElementById('llm-text');
+  const selectedValue = selector.value;
+
+  if (xmlData[selectedValue]) {
+    textArea.value = xmlData[selectedValue];
+  }
+}
+</script>
+</body>
+</html>
+"""
+
+
+def _escape_textarea_end(text: str) -> str:
+    """
+    Escape closing textarea tags so text can be embedded in a <textarea> element.
+
+    Args:
+        text: Text to embed
+
+    Returns:
+        The text itself when it has no closing tag, otherwise an escaped copy
+    """
+    if "</textarea>" not in text:
+        return text
+    return text.replace("</textarea>", "&lt;/textarea&gt;")
+
+
+def build_html(
+    url: str, messages: List[Message], platform_name: str = "ChatGPT", include_llm_view: bool = True
+) -> str:
+    """
+    Build the complete HTML page with conversation content.
+
+    Args:
+        url: The source URL of the conversation
+        messages: List of conversation messages
+        platform_name: Name of the platform ("ChatGPT" or "Claude")
+        include_llm_view: Whether to embed the LLM view (see build_html_parts)
+
+    Returns:
+        Complete HTML string ready to be written to file
+    """
+    return "".join(build_html_parts(url, messages, platform_name, include_llm_view=include_llm_view))
+
+
+def build_html_parts(
+    url: str,
+    messages: List[Message],
+    platform_name: str = "ChatGPT",
+    xml_fragments: Optional[List[str]] = None,
+    include_llm_view: bool = True,
+) -> List[str]:
+    """
+    Build the HTML page with conversation content as a list of pieces.
+
+    Concatenating the pieces gives the page; writing them to a file one by one avoids
+    holding a second, joined copy of the whole document in memory.
+
+    Args:
+        url: The source URL of the conversation
+        messages: List of conversation messages
+        platform_name: Name of the platform ("ChatGPT" or "Claude")
+        xml_fragments: Output of xml_message_fragments(messages), if the caller already has it
+        include_llm_view: Whether to embed the LLM view (the conversation as XML, once per turn option);
+            leaving it out roughly halves the page size for large conversations
+
+    Returns:
+        Pieces of the complete HTML page
+    """
+    # Build navigation sidebar and conversation HTML for human view in a single pass, collecting
+    # the conversation stats for the header, sidebar, and turn selector along the way
+    nav_items = []
+    conversation_html = []
+    user_indices = []
+    n_assistant = 0
+    has_attachments = False
+    for idx, msg in enumerate(messages, 1):
+        is_user = msg.role == "user"
+        if is_user:
+            user_indices.append(idx - 1)
+        elif msg.role == "assistant":
+            n_assistant += 1
+
+        # Check if conversation contains attachment references
+        if not has_attachments and _ATTACHMENT_HIDDEN_RE.search(msg.content):
+            has_attachments = True
+
+        role_emoji = "👤" if is_user else "🤖"
+        role_class = "user" if is_user else "assistant"
+        role_label = "👤 User" if is_user else "🤖 Assistant"
+
+        # Get first line or first 60 chars as preview (find avoids splitting the whole message)
+        newline_idx = msg.content.find("\n")
+        first_line = msg.content if newline_idx == -1 else msg.content[:newline_idx]
+        if len(first_line) > 60 or newline_idx != -1:
+            preview = f"{first_line[:60]}..."
+        else:
+            preview = first_line
+
+        # html.escape measured several times faster than str.translate with an escape table on previews this short
+        nav_items.append(
+            f'<li><a href="#msg-{idx}">{role_emoji} Message {idx}</a>'
+            f'<div class="nav-preview">{html.escape(preview)}</div></li>'
+        )
+
+        # Render markdown content
+        content_html = render_markdown_with_code(msg.content)
+
+        conversation_html.append(
+            f"""
+<div class="message {role_class}" id="msg-{idx}">
+  <div class="message-header">{role_label} <span class="message-number">#{idx}</span></div>
+  <div class="message-content">{content_html}</div>
+  <div class="back-top"><a href="#top">↑ Back to top</a></div>
+</div>
+"""
+        )
+
+    nav_html = "\n".join(nav_items)
+    n_total = len(messages)
+    n_user = n_turns = len(user_indices)
+
+    if include_llm_view:
+        # Generate XML pieces for LLM view, serializing each message only once
+        if xml_fragments is None:
+            xml_fragments = xml_message_fragments(messages)
+        xml_parts = xml_document_parts(xml_fragments)
+
+        # Generate XML for different turn counts for the dropdown. Each filtered document holds a suffix of the
+        # messages, so every fragment is JSON-escaped once and the escaped documents are assembled from slices
+        escaped_fragments = [json_dumps(fragment)[1:-1] for fragment in xml_fragments]
+        xml_data_entries = [f'"all":"{_json_escaped_xml_document(escaped_fragments)}"']
+        turn_options = []
+
+        for n in range(1, min(n_turns + 1, 11)):  # Limit to max 10 turn options
+            start_idx = user_indices[-n]
+            xml_data_entries.append(f'"{n}":"{_json_escaped_xml_document(escaped_fragments[start_idx:])}"')
+            turn_options.append((n, n_total - start_idx))
+
+        # JavaScript object mapping turn counts to escaped XML strings, embedded as a string literal for
+        # JSON.parse (much cheaper for the browser than parsing a large object literal). Escaping "</" and
+        # "<!--" keeps message content from ending or confusing the enclosing <script> element.
+        xml_data_json = f'{{{",".join(xml_data_entries)}}}'
+        xml_data_literal = json_dumps(xml_data_json).replace("</", "<\\/").replace("<!--", "<\\u0021--")
+        turn_options_html = "".join(
+            f'<option value="{n}">Last {n} turn{"s" if n > 1 else ""} ({msg_count} messages)</option>'
+            for n, msg_count in reversed(turn_options)
+        )
+
+    # Build attachment warning if needed
+    attachment_warning = ""
+    if has_attachments:
+        attachment_warning = """
+        <div style="background: #fff3cd; border-left: 4px solid #ffc107; padding: 1rem; margin-bottom: 1rem; border-radius: 4px;">
+          <strong>⚠️ Note:</strong> This conversation referenced attachments (images/PDFs) that are not included in shared links for privacy/security reasons.
+        </div>
+        """
+
+    # Pygments CSS for code highlighting (built once per process)
+    pygments_css = _pygments_css()
+
+    # Assemble the page from pre-rendered chunks joined once at the end; the large pieces
+    # (sidebar, messages, XML) are appended as-is rather than interpolated into f-strings
+    escaped_url = html.escape(url)
+    parts = [
+        _HTML_HEAD,
+        f"<title>{platform_name} Conversation – {escaped_url}</title>\n",
+        _HTML_STYLE,
+        pygments_css,
+        f"""
 </style>
 </head>
 <body>
@@ -1032,9 +1788,11 @@ def build_html(url: str, messages: List[Message], platform_name: str = "ChatGPT"
 <div class="page">
   <nav id="sidebar">
     <div class="sidebar-inner">
-      <h2>📑 Messages ({len(messages)})</h2>
+      <h2>📑 Messages ({n_total})</h2>
       <ul class="nav-list">
-        {nav_html}
+        """,
+        nav_html,
+        f"""
       </ul>
     </div>
   </nav>
@@ -1043,26 +1801,49 @@ def build_html(url: str, messages: List[Message], platform_name: str = "ChatGPT"
     <div class="header">
       <h1>💬 {platform_name} Conversation</h1>
       <div class="meta">
-        <strong>Source:</strong> <a href="{html.escape(url)}" target="_blank">{html.escape(url)}</a>
+        <strong>Source:</strong> <a href="{escaped_url}" target="_blank">{escaped_url}</a>
         <div class="stats">
-          <strong>Total messages:</strong> {len(messages)}
-          · <strong>User:</strong> {sum(1 for m in messages if m.role == 'user')}
-          · <strong>Assistant:</strong> {sum(1 for m in messages if m.role == 'assistant')}
-          · <strong>Turns:</strong> {count_turns(messages)}
+          <strong>Total messages:</strong> {n_total}
+          · <strong>User:</strong> {n_user}
+          · <strong>Assistant:</strong> {n_assistant}
+          · <strong>Turns:</strong> {n_turns}
         </div>
       </div>
     </div>
 
     {attachment_warning}
-
+""",
+    ]
+    if include_llm_view:
+        parts.append(
+            """
   <div class="view-toggle">
     <strong>View:</strong>
     <button class="toggle-btn active" onclick="showHumanView(this)">👤 Human</button>
     <button class="toggle-btn" onclick="showLLMView(this)">🤖 LLM</button>
   </div>
-
+"""
+        )
+    parts.append(
+        """
   <div id="human-view">
-    {conversation_section}
+    """
+    )
+    parts.extend(conversation_html)
+    if not include_llm_view:
+        parts.append(
+            """
+  </div>
+  </main>
+</div>
+</body>
+</html>
+"""
+        )
+        return parts
+
+    parts.append(
+        f"""
   </div>
 
     <div id="llm-view">
@@ -1070,11 +1851,16 @@ def build_html(url: str, messages: List[Message], platform_name: str = "ChatGPT"
       <div style="display: flex; align-items: center; gap: 1rem; margin-bottom: 1rem;">
         <label for="turn-selector" style="font-weight: 500;">Show turns:</label>
         <select id="turn-selector" onchange="updateXMLContent()" style="padding: 0.5rem; border: 1px solid #dadce0; border-radius: 6px; font-size: 0.9rem; cursor: pointer;">
-          <option value="all">All ({count_turns(messages)} turns, {len(messages)} messages)</option>
-          {"".join(f'<option value="{n}">Last {n} turn{"s" if n > 1 else ""} ({msg_count} messages)</option>' for n, msg_count in reversed(turn_options))}
+          <option value="all">All ({n_turns} turns, {n_total} messages)</option>
+          {turn_options_html}
         </select>
       </div>
-      <textarea id="llm-text" readonly>{xml_text.replace('</textarea>', '&lt;/textarea&gt;')}</textarea>
+      <textarea id="llm-text" readonly>"""
+    )
+    # Copy only the messages that would close the textarea early instead of the whole document
+    parts.extend(_escape_textarea_end(part) for part in xml_parts)
+    parts.append(
+        """</textarea>
       <div class="copy-hint">
         💡 <strong>Tip:</strong> Click in the text area and press Ctrl+A (Cmd+A on Mac) to select all, then Ctrl+C (Cmd+C) to copy.
       </div>
@@ -1084,61 +1870,42 @@ def build_html(url: str, messages: List[Message], platform_name: str = "ChatGPT"
 
 <script>
 // Store XML data for different turn counts
-const xmlData = {xml_data_json};
+const xmlData = JSON.parse("""
+    )
+    parts.append(xml_data_literal)
+    parts.append(");\n\n")
+    parts.append(_HTML_SCRIPT)
+    return parts
 
-function showHumanView(btn) {{
-  document.getElementById('human-view').style.display = 'block';
-  document.getElementById('llm-view').style.display = 'none';
-  document.querySelectorAll('.toggle-btn').forEach(b => b.classList.remove('active'));
-  btn.classList.add('active');
-}}
 
-function showLLMView(btn) {{
-  document.getElementById('human-view').style.display = 'none';
-  document.getElementById('llm-view').style.display = 'block';
-  document.querySelectorAll('.toggle-btn').forEach(b => b.classList.remove('active'));
-  btn.classList.add('active');
-
-  // Auto-select all text when switching to LLM view for easy copying
-  setTimeout(() => {{
-    const textArea = document.getElementById('llm-text');
-    textArea.focus();
-    textArea.select();
-  }}, 100);
-}}
+def extract_conversation_id(url: str) -> Optional[str]:
+    """
+    Extract a short conversation ID from a share URL.
 
-function updateXMLContent() {{
-  const selector = document.getElementById('turn-selector');
-  const textArea = document.getElementById('llm-text');
-  const selectedValue = selector.value;
+    Args:
+        url: The conversation URL
 
-  if (xmlData[selectedValue]) {{
-    textArea.value = xmlData[selectedValue];
-  }}
-}}
-</script>
-</body>
-</html>
-"""
+    Returns:
+        First 12 characters of the share ID, or None if the URL has none
+    """
+    match = _SHARE_ID_RE.search(url)
+    if match:
+        return match.group(1)[:12]  # Use first 12 chars
+    return None
 
 
-def derive_output_path(url: str) -> pathlib.Path:
+def derive_output_path(platform: str, conv_id: Optional[str]) -> pathlib.Path:
     """
-    Derive a temporary output path from the conversation URL.
+    Derive an output file name from the conversation's platform and ID.
 
     Args:
-        url: The conversation URL
+        platform: Platform name as returned by detect_platform (used as filename prefix)
+        conv_id: Conversation ID as returned by extract_conversation_id
 
     Returns:
-        Path object for the output HTML file in the current directory
+        Relative path object for the output HTML file
     """
-    # Detect platform for proper filename prefix
-    platform = detect_platform(url)
-
-    # Extract conversation ID from URL
-    match = re.search(r"/share/([a-f0-9-]+)", url)
-    if match:
-        conv_id = match.group(1)[:12]  # Use first 12 chars
+    if conv_id:
         filename = f"{platform}_{conv_id}.html"
     else:
         filename = f"{platform}_conversation.html"
@@ -1146,6 +1913,99 @@ def derive_output_path(url: str) -> pathlib.Path:
     return pathlib.Path(filename)
 
 
+def write_conversation_outputs(
+    args: argparse.Namespace, url: str, platform: str, messages: List[Message], warmup: threading.Thread
+) -> int:
+    """
+    Write the HTML page (and the XML file, if requested) for one fetched conversation.
+
+    Args:
+        args: Parsed command-line arguments
+        url: Shared conversation URL
+        platform: Platform name as returned by detect_platform
+        messages: The conversation's messages
+        warmup: Renderer warmup thread, joined before the page is built
+
+    Returns:
+        Exit code (0 for success, non-zero for failure)
+    """
+    # Extract the conversation ID once for the default HTML and XML file names
+    conv_id = extract_conversation_id(url)
+
+    # Serialize each message to XML once, shared by the XML file and the page's LLM view
+    xml_fragments = None
+    if args.save_xml is not None or not args.no_llm_view:
+        xml_fragments = xml_message_fragments(messages)
+
+    # Save XML if requested
+    if args.save_xml is not None:
+        # Apply turn filter if specified
+        messages_for_xml = messages
+        if args.last_turns is not None:
+            try:
+                total_turns = count_turns(messages)
+                if args.last_turns > total_turns:
+                    print(
+                        f"❌ Error: Requested {args.last_turns} turns but conversation only has {total_turns} turns",
+                        file=sys.stderr,
+                    )
+                    return 1
+                messages_for_xml = filter_last_turns(messages, args.last_turns)
+                print(
+                    f"📊 Filtered to last {args.last_turns} turn(s) "
+                    f"({len(messages_for_xml)} messages out of {len(messages)})",
+                    file=sys.stderr,
+                )
+            except AssertionError as e:
+                print(f"❌ Error: {e}", file=sys.stderr)
+                return 1
+
+        if args.save_xml == "":
+            # Default: save to {conversation_id}.xml in current directory
+            if conv_id:
+                xml_path = pathlib.Path(f"{conv_id}.xml")
+            else:
+                xml_path = pathlib.Path("conversation.xml")
+        else:
+            xml_path = pathlib.Path(args.save_xml)
+
+        print(f"💾 Writing XML file: {xml_path.resolve()}", file=sys.stderr)
+        with open(xml_path, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as f:
+            f.writelines(xml_document_parts(xml_fragments[len(messages) - len(messages_for_xml) :]))
+        xml_size = xml_path.stat().st_size
+        print(f"✓ Wrote {xml_size:,} bytes to {xml_path}", file=sys.stderr)
+
+    print("🔨 Generating HTML...", file=sys.stderr)
+    warmup.join()
+    platform_name = {"chatgpt": "ChatGPT", "claude": "Claude", "grok": "Grok"}[platform]
+    html_parts = build_html_parts(url, messages, platform_name, xml_fragments, include_llm_view=not args.no_llm_view)
+
+    # Set default output path if not provided; a page that is only opened in the browser goes to a
+    # fresh private temp file (left for the OS to clean up) so the process can exit right away
+    fd = None
+    if args.out is not None or args.no_open:
+        out_path = pathlib.Path(args.out) if args.out is not None else derive_output_path(platform, conv_id)
+    else:
+        fd, temp_name = tempfile.mkstemp(prefix=f"{derive_output_path(platform, conv_id).stem}_", suffix=".html")
+        out_path = pathlib.Path(temp_name)
+
+    with (
+        open(out_path, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE)
+        if fd is None
+        else os.fdopen(fd, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE)
+    ) as f:
+        print(f"💾 Writing HTML file: {out_path.resolve()}", file=sys.stderr)
+        f.writelines(html_parts)
+    file_size = out_path.stat().st_size
+    print(f"✓ Wrote {file_size:,} bytes to {out_path}", file=sys.stderr)
+
+    if not args.no_open:
+        print(f"🌐 Opening {out_path} in browser...", file=sys.stderr)
+        webbrowser.open_new_tab(out_path.resolve().as_uri())
+
+    return 0
+
+
 def main() -> int:
     """
     Main entry point for the renderchat CLI.
@@ -1155,11 +2015,21 @@ def main() -> int:
     """
     ap = argparse.ArgumentParser(description="Render ChatGPT, Claude, or Grok conversations to a single HTML page")
     ap.add_argument(
-        "url",
-        help="Shared conversation URL (https://chatgpt.com/share/..., https://claude.ai/share/..., or https://grok.com/share/...)",
+        "urls",
+        nargs="+",
+        metavar="url",
+        help=(
+            "Shared conversation URL (https://chatgpt.com/share/..., https://claude.ai/share/..., or "
+            "https://grok.com/share/...); several URLs are fetched concurrently"
+        ),
     )
     ap.add_argument("-o", "--out", help="Output HTML file path (default: temporary file derived from conversation ID)")
     ap.add_argument("--no-open", action="store_true", help="Don't open the HTML file in browser after generation")
+    ap.add_argument(
+        "--no-llm-view",
+        action="store_true",
+        help="Leave the XML LLM view out of the HTML page (much smaller pages for long conversations)",
+    )
     ap.add_argument(
         "--save-xml",
         nargs="?",
@@ -1173,6 +2043,13 @@ def main() -> int:
         metavar="N",
         help="Include only the last N conversation turns (user-assistant pairs) in saved XML. Requires --save-xml.",
     )
+    ap.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=DEFAULT_CACHE_TTL,
+        metavar="SECONDS",
+        help=f"Reuse a cached page younger than SECONDS instead of refetching (default: {DEFAULT_CACHE_TTL}, 0 disables)",
+    )
     args = ap.parse_args()
 
     # Validate arguments
@@ -1183,93 +2060,41 @@ def main() -> int:
         if args.last_turns <= 0:
             print("❌ Error: --last-turns must be a positive integer", file=sys.stderr)
             return 1
+    if len(args.urls) > 1 and (args.out is not None or args.save_xml):
+        print("❌ Error: --out and --save-xml PATH can only be used with a single URL", file=sys.stderr)
+        return 1
 
     # Validate URL format
     try:
-        platform = detect_platform(args.url)
+        platforms = [detect_platform(url) for url in args.urls]
     except ValueError as e:
         print(f"❌ Error: {e}", file=sys.stderr)
         return 1
 
-    # Set default output path if not provided
-    if args.out is None:
-        args.out = str(derive_output_path(args.url))
+    # Warm up the renderer while waiting on the network
+    warmup = threading.Thread(target=_warm_up_rendering, daemon=True)
+    warmup.start()
 
     try:
-        print(f"🌐 Fetching conversation from {args.url}...", file=sys.stderr)
-        messages = fetch_conversation(args.url)
-        print(
-            f"✓ Fetched {len(messages)} messages "
-            f"({sum(1 for m in messages if m.role == 'user')} user, "
-            f"{sum(1 for m in messages if m.role == 'assistant')} assistant)",
-            file=sys.stderr,
-        )
-
-        # Save XML if requested
-        if args.save_xml is not None:
-            # Apply turn filter if specified
-            messages_for_xml = messages
-            if args.last_turns is not None:
-                try:
-                    total_turns = count_turns(messages)
-                    if args.last_turns > total_turns:
-                        print(
-                            f"❌ Error: Requested {args.last_turns} turns but conversation only has {total_turns} turns",
-                            file=sys.stderr,
-                        )
-                        return 1
-                    messages_for_xml = filter_last_turns(messages, args.last_turns)
-                    print(
-                        f"📊 Filtered to last {args.last_turns} turn(s) "
-                        f"({len(messages_for_xml)} messages out of {len(messages)})",
-                        file=sys.stderr,
-                    )
-                except AssertionError as e:
-                    print(f"❌ Error: {e}", file=sys.stderr)
-                    return 1
-
-            xml_content = generate_xml_text(messages_for_xml)
-            if args.save_xml == "":
-                # Default: save to {conversation_id}.xml in current directory
-                match = re.search(r"/share/([a-f0-9-]+)", args.url)
-                if match:
-                    conv_id = match.group(1)[:12]
-                    xml_path = pathlib.Path(f"{conv_id}.xml")
-                else:
-                    xml_path = pathlib.Path("conversation.xml")
-            else:
-                xml_path = pathlib.Path(args.save_xml)
-
-            print(f"💾 Writing XML file: {xml_path.resolve()}", file=sys.stderr)
-            xml_path.write_text(xml_content, encoding="utf-8")
-            xml_size = xml_path.stat().st_size
-            print(f"✓ Wrote {xml_size:,} bytes to {xml_path}", file=sys.stderr)
-
-        print("🔨 Generating HTML...", file=sys.stderr)
-        platform_name = {"chatgpt": "ChatGPT", "claude": "Claude", "grok": "Grok"}[platform]
-        html_out = build_html(args.url, messages, platform_name)
-
-        out_path = pathlib.Path(args.out)
-        print(f"💾 Writing HTML file: {out_path.resolve()}", file=sys.stderr)
-        out_path.write_text(html_out, encoding="utf-8")
-        file_size = out_path.stat().st_size
-        print(f"✓ Wrote {file_size:,} bytes to {out_path}", file=sys.stderr)
-
-        if not args.no_open:
-            print(f"🌐 Opening {out_path} in browser...", file=sys.stderr)
-            webbrowser.open(str(out_path.resolve().as_uri()))
-
-            # Wait for browser to load the file before deleting
-            time.sleep(10)
-
-            # Remove the HTML file after browser has loaded it
-            try:
-                out_path.unlink()
-                print("🧹 Removed temporary file", file=sys.stderr)
-            except Exception:
-                pass  # Silently ignore if removal fails
+        if len(args.urls) == 1:
+            print(f"🌐 Fetching conversation from {args.urls[0]}...", file=sys.stderr)
+            conversations = [fetch_conversation(args.urls[0], cache_ttl=args.cache_ttl)]
+        else:
+            print(f"🌐 Fetching {len(args.urls)} conversations...", file=sys.stderr)
+            conversations = asyncio.run(fetch_conversations_async(args.urls, cache_ttl=args.cache_ttl))
+
+        # A conversation that fails to write doesn't stop the others; the failure is reported at the end
+        exit_code = 0
+        for url, platform, messages in zip(args.urls, platforms, conversations):
+            role_counts = Counter(m.role for m in messages)
+            print(
+                f"✓ Fetched {len(messages)} messages "
+                f"({role_counts['user']} user, {role_counts['assistant']} assistant)",
+                file=sys.stderr,
+            )
+            exit_code = write_conversation_outputs(args, url, platform, messages, warmup) or exit_code
 
-        return 0
+        return exit_code
 
     except PlaywrightTimeout as e:
         print(f"❌ Error: Page load timeout - {e}", file=sys.stderr)